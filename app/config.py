@@ -5,7 +5,6 @@ Functions to configure the Streamlit app and manage session state.
 """
 
 import streamlit as st
-import pandas as pd
 
 
 def setup_page():
@@ -22,18 +21,10 @@ def initialize_session_state():
     """Initialize the session state variables if they don't exist"""
     if 'ticker' not in st.session_state:
         st.session_state.ticker = ""
-    if 'avg_polarity' not in st.session_state:
-        st.session_state.avg_polarity = 0.0
-    if 'avg_subjectivity' not in st.session_state:
-        st.session_state.avg_subjectivity = 0.0
-    if 'overall_sentiment' not in st.session_state:
-        st.session_state.overall_sentiment = "Neutral"
-    if 'news_df' not in st.session_state:
-        st.session_state.news_df = pd.DataFrame()
-    if 'combined_sentiment' not in st.session_state:
-        st.session_state.combined_sentiment = None
-    if 'analysis_performed' not in st.session_state:
-        st.session_state.analysis_performed = False
+    if 'last_analysis' not in st.session_state:
+        st.session_state.last_analysis = None
+    if 'analysis_results' not in st.session_state:
+        st.session_state.analysis_results = None
     if 'num_articles' not in st.session_state:
         st.session_state.num_articles = 3
 
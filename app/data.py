@@ -4,56 +4,152 @@ Data Collection and Processing
 Functions for fetching and analyzing stock news data.
 """
 
-import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import aiohttp
+import numpy as np
 import pandas as pd
 import streamlit as st
 import yfinance as yf
-from scraper import extract_article_text
-from sentiment import analyze_sentiment, calculate_combined_sentiment
+from scraper import extract_article_text, extract_article_text_async
+from sentiment import calculate_combined_sentiment, classify_polarities, classify_polarity, score_sentiment
+
+# Maximum number of article pages downloaded at the same time
+MAX_CONCURRENT_SCRAPES = 8
+
+# Maximum number of threads scoring article sentiment at the same time
+MAX_SENTIMENT_WORKERS = 8
+
+# Query parameters that only track where a click came from (besides utm_*)
+TRACKING_PARAMS = {'fbclid', 'gclid'}
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _fetch_stock_news(ticker_symbol, num_articles):
+    """Fetch news from Yahoo; errors propagate so that failed lookups aren't cached"""
+    # Get news using yf.Search
+    news = yf.Search(ticker_symbol, news_count=num_articles).news
+
+    # Limit to specified number of articles
+    return news[:num_articles] if news else []
+
 
 def get_stock_news(ticker_symbol, num_articles=5):
     """
         Fetch recent news articles for a given stock ticker
 
+        Successful results are cached for ten minutes so reruns don't query Yahoo again.
+
         Parameters:
             ticker_symbol (str): The stock ticker symbol (e.g., 'AAPL')
             num_articles (int): Number of articles to retrieve
 
         Returns:
-            list: List of news dictionaries with 'title', 'link', and 'publisher'
+            tuple: (news, error_message) - news is a list of dictionaries with 'title',
+                'link' and 'publisher'; the error message is set if fetching failed
     """
     try:
-        # Get news using yf.Search
-        news = yf.Search(ticker_symbol, news_count=num_articles).news
-        print(news)  # Debugging line to check the news data
-
-        # Limit to specified number of articles
-        if news and len(news) > 0:
-            return news[:num_articles]
-        else:
-            return []
+        return _fetch_stock_news(ticker_symbol, num_articles), None
     except Exception as e:
-        st.error(f"Error fetching news for {ticker_symbol}: {e}")
-        return []
+        return [], f"Error fetching news for {ticker_symbol}: {e}"
 
 
+async def _scrape_articles(urls):
+    """
+        Download and extract the full text of all article URLs concurrently
 
-def process_article(article, index, total_articles, status_text):
+        Parameters:
+            urls (tuple): The article URLs to scrape
+
+        Returns:
+            list: (article_text, error_message) for each URL, in the same order
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+
+    async def _bounded(session, article_url):
+        if not article_url:
+            return "", None
+        async with semaphore:
+            return await extract_article_text_async(session, article_url)
+
+    # Share one connection pool across all article requests
+    connector = aiohttp.TCPConnector(limit=10)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*[_bounded(session, article_url) for article_url in urls],
+                                       return_exceptions=True)
+
+    # A failure in one article must not discard the others
+    return [
+        ("", f"Could not extract text from {article_url}. Error: {str(result)}")
+        if isinstance(result, BaseException) else result
+        for article_url, result in zip(urls, results)
+    ]
+
+
+def scrape_articles(urls):
     """
-        Process a single news article to extract and analyze its content
+        Extract the full text of all article URLs, fetching them concurrently
+
+        Extracted texts are cached on disk by URL, so re-analyzing a ticker doesn't
+        scrape the same pages again, while failed pages are retried.
 
         Parameters:
-            article (dict): The article to process
-            index (int): The index of the article in the list
-            total_articles (int): Total number of articles
-            status_text (streamlit.delta_generator.DeltaGenerator): For status updates
+            urls (tuple): The article URLs to scrape
 
         Returns:
-            dict: Dictionary with article data and sentiment analysis
+            list: (article_text, error_message) for each URL, in the same order
     """
-    status_text.text(f"Processing article {index + 1} of {total_articles}...")
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop is running in this thread, so the async scraper can run its own
+        return asyncio.run(_scrape_articles(urls))
+
+    # An event loop is already running in this thread, so scrape on a thread pool instead
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCRAPES) as executor:
+        return list(executor.map(_extract_article_text_or_empty, urls))
+
 
+def _extract_article_text_or_empty(article_url):
+    """Synchronously scrape one article URL, skipping articles without a link"""
+    if not article_url:
+        return "", None
+    return extract_article_text(article_url)
+
+
+def _normalize_url(url):
+    """
+        Normalize an article URL so the same story shared with different tracking
+        parameters is recognized as a duplicate
+
+        Parameters:
+            url (str): The article URL
+
+        Returns:
+            str: The URL with a lowercase host and without tracking query parameters
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def process_article(article, article_full_text):
+    """
+        Analyze the content of a single news article
+
+        Parameters:
+            article (dict): The article to process
+            article_full_text (str): The scraped article text (empty if unavailable)
+
+        Returns:
+            dict: Dictionary with article data and sentiment scores (labels are
+                added for all articles at once by analyze_stock_news_sentiment)
+    """
     # Get article URL and basic info
     article_url = article.get('link', '')
     title = article.get('title', '')
@@ -61,23 +157,17 @@ def process_article(article, index, total_articles, status_text):
 
     # For headline sentiment
     headline_text = f"{title} {summary}"
-    headline_polarity, headline_subjectivity, headline_sentiment, headline_emoji = analyze_sentiment(headline_text)
-
-    # Get article full text if URL is available
-    article_full_text = ""
-    if article_url:
-        status_text.text(f"Extracting text from article {index + 1}...")
-        article_full_text = extract_article_text(article_url)
-        time.sleep(0.5)  # Small delay to avoid overloading servers
+    headline_polarity, headline_subjectivity = score_sentiment(headline_text)
 
     # For full article sentiment (if available)
     if article_full_text:
-        full_text_polarity, full_text_subjectivity, full_text_sentiment, full_text_emoji = analyze_sentiment(
-            article_full_text)
+        full_text_polarity, full_text_subjectivity = score_sentiment(article_full_text)
     else:
         # Use headline sentiment if full text is not available
-        full_text_polarity, full_text_subjectivity, full_text_sentiment, full_text_emoji = headline_polarity, headline_subjectivity, headline_sentiment, headline_emoji
-        article_full_text = "Could not extract full article text"
+        full_text_polarity, full_text_subjectivity = headline_polarity, headline_subjectivity
+
+    # Raw publish timestamp, formatted for the whole DataFrame at once later
+    publish_time = article.get('providerPublishTime')
 
     # Create result dictionary
     return {
@@ -86,93 +176,189 @@ def process_article(article, index, total_articles, status_text):
         'link': article_url,
         'headline_polarity': headline_polarity,
         'headline_subjectivity': headline_subjectivity,
-        'headline_sentiment': headline_sentiment,
-        'headline_emoji': headline_emoji,
         'full_text_polarity': full_text_polarity,
         'full_text_subjectivity': full_text_subjectivity,
-        'full_text_sentiment': full_text_sentiment,
-        'full_text_emoji': full_text_emoji,
-        'article_text': article_full_text[:500] + "..." if len(article_full_text) > 500 else article_full_text,
-        'published': article.get('providerPublishTime', 'Unknown'),
-        'raw_text': article_full_text  # Store full text for combined analysis
+        'article_text': (article_full_text[:500] + "..." if len(article_full_text) > 500 else article_full_text)
+        if article_full_text else None,
+        'publish_ts': publish_time if isinstance(publish_time, (int, float)) else None
     }
 
 
 
+def build_news_dataframe(results):
+    """
+        Build the news DataFrame from processed articles with a fixed, compact schema
+
+        Each column is built directly with its final dtype, so pandas doesn't have to
+        infer types from a list of dictionaries and convert them afterwards.
+
+        Parameters:
+            results (list): Article dictionaries returned by process_article
+
+        Returns:
+            pandas.DataFrame: One row per article, ready for display
+    """
+    def _scores(key):
+        return np.fromiter((result[key] for result in results), np.float64, count=len(results))
+
+    def _column(key, dtype):
+        return pd.array([result[key] for result in results], dtype=dtype)
+
+    headline_polarity = _scores('headline_polarity')
+    full_text_polarity = _scores('full_text_polarity')
+
+    # Label all headline and full text scores in one vectorized pass
+    headline_sentiment, headline_emoji = classify_polarities(headline_polarity)
+    full_text_sentiment, full_text_emoji = classify_polarities(full_text_polarity)
+
+    # Format all publish times in one vectorized pass
+    published = (
+        pd.to_datetime(pd.Series([result['publish_ts'] for result in results], dtype='float64'),
+                       unit='s', errors='coerce')
+        .dt.strftime('%Y-%m-%d %H:%M:%S UTC')
+        .fillna('Unknown')
+    )
+
+    return pd.DataFrame({
+        'title': _column('title', 'string[pyarrow]'),
+        'publisher': _column('publisher', 'category'),
+        'link': _column('link', 'string[pyarrow]'),
+        'headline_polarity': headline_polarity.astype(np.float32),
+        'headline_subjectivity': _scores('headline_subjectivity').astype(np.float32),
+        'headline_sentiment': pd.Categorical(headline_sentiment),
+        'headline_emoji': pd.Categorical(headline_emoji),
+        'full_text_polarity': full_text_polarity.astype(np.float32),
+        'full_text_subjectivity': _scores('full_text_subjectivity').astype(np.float32),
+        'full_text_sentiment': pd.Categorical(full_text_sentiment),
+        'full_text_emoji': pd.Categorical(full_text_emoji),
+        'article_text': _column('article_text', 'string[pyarrow]'),
+        'published': pd.array(published, dtype='string[pyarrow]')
+    }, copy=False)
+
+
+class IncompleteAnalysisError(Exception):
+    """Carries analysis results out of the cached function so that they aren't cached"""
+
+    def __init__(self, results, messages):
+        super().__init__(messages)
+        self.results = results
+        self.messages = messages
+
+
 def analyze_stock_news_sentiment(ticker_symbol, num_articles=5):
     """
         Analyze sentiment of news articles for a stock
 
+        Doesn't draw anything, so its results can be cached; problems are returned
+        as messages for the caller to display.
+
         Parameters:
             ticker_symbol (str): The stock ticker symbol
             num_articles (int): Number of articles to analyze
 
         Returns:
-            tuple: (avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment)
+            tuple: (results, messages) - results is (avg_polarity, avg_subjectivity,
+                overall_sentiment, news_df, combined_sentiment); messages is a list of
+                (level, text) pairs, where level is 'error' or 'warning'
     """
-    news_articles = get_stock_news(ticker_symbol, num_articles)
+    messages = []
+    news_articles, error_message = get_stock_news(ticker_symbol, num_articles)
+    if error_message:
+        messages.append(('error', error_message))
 
     if not news_articles:
-        return 0.0, 0.0, "Neutral", pd.DataFrame(), None
-
-    # Set up a progress bar for article scraping
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+        return (0.0, 0.0, "Neutral", pd.DataFrame(), None), messages
+
+    # Drop repeated articles (same normalized URL, or same title if there is no link),
+    # keeping the first occurrence
+    seen_keys = set()
+    unique_articles = []
+    for article in news_articles:
+        key = _normalize_url(article.get('link', '')) or article.get('title', '')
+        if key and key in seen_keys:
+            continue
+        seen_keys.add(key)
+        unique_articles.append(article)
+    news_articles = unique_articles
+
+    # Fetch the full text of every article at once
+    scraped = scrape_articles(tuple(article.get('link', '') for article in news_articles))
+
+    article_texts = []
+    for article_text, error_message in scraped:
+        if error_message:
+            messages.append(('warning', error_message))
+        article_texts.append(article_text)
 
     # Process each article
     results = []
-    all_article_texts = []
-
-    for i, article in enumerate(news_articles):
-        article_data = process_article(article, i, len(news_articles), status_text)
-        results.append(article_data)
-
-        # Add full text to collection for combined analysis
-        if article_data['raw_text']:
-            all_article_texts.append(article_data['raw_text'])
-
-        # Update progress bar
-        progress_bar.progress((i + 1) / len(news_articles))
-
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
-
-    # Convert to DataFrame and remove raw text column (not needed for display)
-    for result in results:
-        if 'raw_text' in result:
-            del result['raw_text']
-    news_df = pd.DataFrame(results)
-
-    # Calculate aggregate sentiment metrics
-    if not news_df.empty:
-        avg_polarity = news_df['full_text_polarity'].mean()
-        avg_subjectivity = news_df['full_text_subjectivity'].mean()
-
-        # Determine overall sentiment based on full text analysis
-        if avg_polarity > 0.1:
-            overall_sentiment = "Positive"
-        elif avg_polarity < -0.1:
-            overall_sentiment = "Negative"
-        else:
-            overall_sentiment = "Neutral"
-    else:
-        avg_polarity = 0.0
-        avg_subjectivity = 0.0
-        overall_sentiment = "Neutral"
+    polarities = []
+    subjectivities = []
+    weights = []
+
+    # Score all articles in parallel; results come back in article order
+    with ThreadPoolExecutor(max_workers=min(MAX_SENTIMENT_WORKERS, len(news_articles))) as executor:
+        processed = executor.map(process_article, news_articles, article_texts)
+
+        for article_text, article_data in zip(article_texts, processed):
+            results.append(article_data)
+
+            # Collect full text scores for combined analysis, weighted by article length
+            if article_text:
+                polarities.append(article_data['full_text_polarity'])
+                subjectivities.append(article_data['full_text_subjectivity'])
+                weights.append(len(article_text))
+
+    # Calculate aggregate sentiment metrics from the processed rows
+    full_text_polarities = np.fromiter((result['full_text_polarity'] for result in results),
+                                       np.float64, count=len(results))
+    full_text_subjectivities = np.fromiter((result['full_text_subjectivity'] for result in results),
+                                           np.float64, count=len(results))
+    avg_polarity = float(full_text_polarities.mean()) if full_text_polarities.size else 0.0
+    avg_subjectivity = float(full_text_subjectivities.mean()) if full_text_subjectivities.size else 0.0
+
+    # Determine overall sentiment based on full text analysis
+    overall_sentiment, _ = classify_polarity(avg_polarity)
+
+    news_df = build_news_dataframe(results)
 
     # Perform combined sentiment analysis on all articles together
-    combined_sentiment = calculate_combined_sentiment(all_article_texts)
+    combined_sentiment = calculate_combined_sentiment(polarities, subjectivities, weights)
+
+    return (avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment), messages
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_analysis(ticker, num_articles):
+    """
+        Analyze news sentiment for a ticker, caching complete results across sessions
+
+        Results with errors are raised instead of returned, so Streamlit doesn't
+        cache them and the next run tries again.
+
+        Parameters:
+            ticker (str): The stock ticker symbol
+            num_articles (int): Number of articles to analyze
+
+        Returns:
+            tuple: (avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment)
 
-    return avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment
+        Raises:
+            IncompleteAnalysisError: If fetching news or any article failed
+    """
+    results, messages = analyze_stock_news_sentiment(ticker, num_articles)
+    if messages:
+        raise IncompleteAnalysisError(results, messages)
+    return results
 
 
-def perform_stock_news_analysis(ticker):
+def perform_stock_news_analysis(ticker, num_articles=None):
     """
-        Perform sentiment analysis on stock news and save results to session state
+        Perform sentiment analysis on stock news and remember the results in session state
 
         Parameters:
             ticker (str): The stock ticker symbol to analyze
+            num_articles (int): Number of articles to analyze (defaults to the sidebar setting)
 
         Returns:
             tuple or None: Analysis results or None if analysis couldn't be performed
@@ -181,38 +367,29 @@ def perform_stock_news_analysis(ticker):
         st.warning("⚠️ Please enter a stock ticker above before analyzing.")
         return None
 
-    # Check if we already have results for this ticker
-    if st.session_state.ticker == ticker and st.session_state.analysis_performed:
-        # Use the saved results
-        return (
-            st.session_state.avg_polarity,
-            st.session_state.avg_subjectivity,
-            st.session_state.overall_sentiment,
-            st.session_state.news_df,
-            st.session_state.combined_sentiment
-        )
-    else:
-        # Show analysis in progress
-        with st.spinner(f'Fetching and analyzing recent news for {ticker}...'):
-            # Get number of articles to analyze
-            num_articles = st.session_state.get('num_articles', 3)
-
-            # Perform the analysis
-            avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment = analyze_stock_news_sentiment(
-                ticker, num_articles)
-
-            # Save results to session state
-            st.session_state.ticker = ticker
-            st.session_state.avg_polarity = avg_polarity
-            st.session_state.avg_subjectivity = avg_subjectivity
-            st.session_state.overall_sentiment = overall_sentiment
-            st.session_state.news_df = news_df
-            st.session_state.combined_sentiment = combined_sentiment
-            st.session_state.analysis_performed = True
-
-            # Check if we got any news
-            if news_df.empty:
-                st.warning(f"No news articles found for {ticker}. Please check the ticker symbol and try again.")
-                return None
-
-            return avg_polarity, avg_subjectivity, overall_sentiment, news_df, combined_sentiment
+    if num_articles is None:
+        num_articles = st.session_state.get('num_articles', 3)
+
+    with st.spinner(f"Fetching and analyzing recent news for {ticker}..."):
+        try:
+            results, messages = _cached_analysis(ticker, num_articles), []
+        except IncompleteAnalysisError as incomplete:
+            results, messages = incomplete.results, incomplete.messages
+
+    for level, message in messages:
+        if level == 'error':
+            st.error(message)
+        else:
+            st.warning(message)
+
+    # Check if we got any news
+    news_df = results[3]
+    if news_df.empty:
+        st.warning(f"No news articles found for {ticker}. Please check the ticker symbol and try again.")
+        results = None
+
+    # Remember the results, complete or not, so reruns show them without analyzing again
+    st.session_state.last_analysis = (ticker, num_articles)
+    st.session_state.analysis_results = results
+
+    return results
@@ -10,7 +10,6 @@ import streamlit as st
 from config import setup_page, initialize_session_state, create_sidebar
 from ui import create_main_section, display_analysis_results
 from data import perform_stock_news_analysis
-import pandas as pd
 
 def main():
     """Main entry point for the Stock Sentiment Analysis application"""
@@ -50,10 +49,9 @@ def main():
     with col2:
         # Add a button to clear results
         if st.button("Clear Saved Results"):
-            st.session_state.analysis_performed = False
+            st.session_state.last_analysis = None
+            st.session_state.analysis_results = None
             st.session_state.ticker = ""
-            st.session_state.news_df = pd.DataFrame()
-            st.session_state.combined_sentiment = None
             st.rerun()
 
     # Step 8: Perform analysis when button is pressed or if we have saved results
@@ -61,16 +59,10 @@ def main():
         results = perform_stock_news_analysis(ticker)
         if results:
             display_analysis_results(ticker, *results)
-    elif st.session_state.analysis_performed and st.session_state.ticker:
-        # Display saved results
-        display_analysis_results(
-            st.session_state.ticker,
-            st.session_state.avg_polarity,
-            st.session_state.avg_subjectivity,
-            st.session_state.overall_sentiment,
-            st.session_state.news_df,
-            st.session_state.combined_sentiment
-        )
+    elif st.session_state.analysis_results:
+        # Display saved results without fetching or analyzing again
+        saved_ticker, _ = st.session_state.last_analysis
+        display_analysis_results(saved_ticker, *st.session_state.analysis_results)
 
 
 
@@ -4,57 +4,182 @@ Web Scraping Utilities
 Functions for extracting text from news articles.
 """
 
+import asyncio
+import hashlib
+from pathlib import Path
+
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from diskcache import Cache
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
 import re
-import streamlit as st
+import trafilatura
+from urllib3.util.retry import Retry
+
+
+# Add user agent to avoid being blocked
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Pages are truncated to this many (decompressed) bytes before parsing
+MAX_PAGE_BYTES = 512 * 1024
+
+# Reuse connections across articles so requests to the same host skip the handshake
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# Scraped article text persisted on disk, shared by all sessions and kept across restarts
+_ARTICLE_CACHE = Cache(Path(__file__).parent / ".cache" / "articles", size_limit=256 * 1024 * 1024)
+ARTICLE_CACHE_TTL = 24 * 60 * 60
+
+_UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+_WS_RE = re.compile(r'\s+')
+
+# Error banner that appears in the text of some Yahoo articles
+_BANNER = "Oops, something went wrong Unlock stock picks and a broker-level newsfeed that powers Wall"
+
+
+def parse_article_html(html):
+    """
+        Extract the main text content from the HTML of a news article
+
+        Parameters:
+            html (str): The raw HTML of the article page
+
+        Returns:
+            str: The extracted article text
+    """
+    # Extract only the article body, leaving out navigation, teasers and disclaimers
+    article_text = trafilatura.extract(html, include_comments=False, include_tables=False,
+                                       favor_precision=True)
+
+    # Fall back to joining all paragraphs if no article body was recognized
+    if not article_text:
+        article_text = _join_paragraphs(html)
+
+    # Collapse whitespace and remove the error banner
+    return _WS_RE.sub(' ', article_text).replace(_BANNER, '').strip()
+
+
+def _join_paragraphs(html):
+    """Join the text of every paragraph on the page outside the page chrome"""
+    if not html.strip():
+        return ""
+
+    # Parse the HTML content (already decoded, so ignore any declared encoding)
+    try:
+        tree = lxml_html.fromstring(html.encode('utf-8'), parser=_UTF8_HTML_PARSER)
+    except etree.ParserError:
+        # Pages without any elements, e.g. only a comment, have no paragraphs
+        return ""
+
+    # Remove page chrome and sidebars whose paragraphs aren't part of the article. Script
+    # and style contents are raw text, never <p> elements, so they needn't be removed
+    for page_chrome in tree.xpath('//header|//footer|//nav|//aside'):
+        if page_chrome.getparent() is not None:
+            page_chrome.getparent().remove(page_chrome)
+
+    # Join paragraph text, which usually contains the main article text
+    return ' '.join(part.strip() for part in tree.xpath('//p//text()') if part.strip())
+
+
+def _article_cache_key(url):
+    """Return the on-disk cache key for an article URL"""
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
 
 
 def extract_article_text(url):
     """
         Extract the main text content from a news article URL
 
+        Extracted texts are cached per URL on disk, so reruns don't download the
+        same page again; failed downloads aren't cached and are retried.
+
         Parameters:
             url (str): The URL of the news article
 
         Returns:
-            str: The extracted article text or empty string if extraction fails
+            tuple: (article_text, error_message) - the text is empty and the
+                error message set if extraction fails
     """
+    key = _article_cache_key(url)
+    cached_text = _ARTICLE_CACHE.get(key)
+    if cached_text is not None:
+        return cached_text, None
+
     try:
-        # Add user agent to avoid being blocked
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        # Send request to get the webpage, reading at most MAX_PAGE_BYTES of it
+        with _SESSION.get(url, timeout=10, stream=True) as response:
+            # Check if request was successful
+            if response.status_code != 200:
+                return "", None
 
-        # Send request to get the webpage
-        response = requests.get(url, headers=headers, timeout=10)
+            # Skip PDFs, videos and other pages without article HTML
+            if 'html' not in response.headers.get('content-type', '').lower():
+                return "", None
 
-        # Check if request was successful
-        if response.status_code != 200:
-            return ""
+            raw = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
 
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
+            # requests assumes ISO-8859-1 for text without a declared charset; most news pages are UTF-8
+            content_type = response.headers.get('content-type', '').lower()
+            encoding = response.encoding if 'charset=' in content_type else 'utf-8'
+            html = raw.decode(encoding, errors='replace')
 
-        # Remove script and style elements that might contain irrelevant text
-        for script_or_style in soup(['script', 'style', 'header', 'footer', 'nav']):
-            script_or_style.extract()
+        article_text = parse_article_html(html)
+        _ARTICLE_CACHE.set(key, article_text, expire=ARTICLE_CACHE_TTL)
+        return article_text, None
 
-        # Get all paragraphs which usually contain the main article text
-        paragraphs = soup.find_all('p')
+    except Exception as e:
+        return "", f"Could not extract text from {url}. Error: {str(e)}"
 
-        # Join paragraphs to form the complete article text
-        article_text = ' '.join([p.get_text().strip() for p in paragraphs])
 
-        # Clean up the text (remove extra whitespace, etc.)
-        article_text = re.sub(r'\s+', ' ', article_text).strip()
+async def extract_article_text_async(session, url):
+    """
+        Asynchronously extract the main text content from a news article URL
 
-        # Remove the specific error string that appears in some articles
-        article_text = article_text.replace(
-            "Oops, something went wrong Unlock stock picks and a broker-level newsfeed that powers Wall", "")
+        Parameters:
+            session (aiohttp.ClientSession): Shared HTTP session for all article requests
+            url (str): The URL of the news article
+
+        Returns:
+            tuple: (article_text, error_message) - the text is empty and the
+                error message set if extraction fails
+    """
+    key = _article_cache_key(url)
+    # The disk cache does blocking SQLite I/O, so keep it off the event loop
+    cached_text = await asyncio.to_thread(_ARTICLE_CACHE.get, key)
+    if cached_text is not None:
+        return cached_text, None
 
-        return article_text
+    try:
+        # Send request to get the webpage, reading at most MAX_PAGE_BYTES of it
+        async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            # Check if request was successful
+            if response.status != 200:
+                return "", None
+
+            # Skip PDFs, videos and other pages without article HTML
+            if 'html' not in response.headers.get('content-type', '').lower():
+                return "", None
+
+            raw = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                raw += chunk
+                if len(raw) >= MAX_PAGE_BYTES:
+                    break
+            html = bytes(raw[:MAX_PAGE_BYTES]).decode(response.charset or 'utf-8', errors='replace')
+
+        # Parse on a worker thread so other downloads keep progressing meanwhile
+        article_text = await asyncio.to_thread(parse_article_html, html)
+        await asyncio.to_thread(_ARTICLE_CACHE.set, key, article_text, expire=ARTICLE_CACHE_TTL)
+        return article_text, None
 
     except Exception as e:
-        st.warning(f"Could not extract text from {url}. Error: {str(e)}")
-        return ""
+        return "", f"Could not extract text from {url}. Error: {str(e)}"
@@ -4,53 +4,158 @@ Sentiment Analysis Tools
 Functions for analyzing text sentiment.
 """
 
-from textblob import TextBlob
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import xxhash
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Number of texts whose sentiment results are kept in memory
+SENTIMENT_CACHE_SIZE = 4096
+
+# Texts longer than this are cached by digest instead of by the text itself
+MAX_CACHE_KEY_LENGTH = 1024
+
+_long_text_cache = OrderedDict()
+_long_text_cache_lock = threading.Lock()
+
+# The VADER lexicon is loaded once when the module is imported
+_SIA = SentimentIntensityAnalyzer()
+
+# Labels indexed by classification: 0 = negative, 1 = neutral, 2 = positive
+_SENTIMENT_LABELS = np.array(["Negative", "Neutral", "Positive"])
+_SENTIMENT_EMOJIS = np.array(["😠", "😐", "😊"])
 
 
 def analyze_sentiment(text):
     """
-    Analyze text sentiment using TextBlob.
+    Analyze text sentiment using VADER.
 
     Parameters:
-        text (str): The text to analyze
+        text (str): The text to analyze (other values are converted with str())
 
     Returns:
         tuple: (polarity, subjectivity, sentiment_label, emoji)
     """
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity  # -1 (negative) to 1 (positive)
-    subjectivity = blob.sentiment.subjectivity  # 0 (objective) to 1 (subjective)
+    polarity, subjectivity = score_sentiment(text)
+    sentiment_label, emoji = classify_polarity(polarity)
+
+    return polarity, subjectivity, sentiment_label, emoji
+
+
+def score_sentiment(text):
+    """
+    Score text sentiment using VADER, without classifying it.
+
+    Results are memoized, so repeated headlines and articles across reruns
+    are only analyzed once. Long texts are keyed by a digest to bound memory.
+
+    Parameters:
+        text (str): The text to analyze (other values are converted with str())
+
+    Returns:
+        tuple: (polarity, subjectivity)
+    """
+    # Cache keys must be hashable strings
+    if not isinstance(text, str):
+        text = str(text)
+
+    if len(text) <= MAX_CACHE_KEY_LENGTH:
+        return _score_short_text(text)
+
+    key = _text_cache_key(text)
+    with _long_text_cache_lock:
+        if key in _long_text_cache:
+            _long_text_cache.move_to_end(key)
+            return _long_text_cache[key]
+
+    result = _score_text(text)
+    with _long_text_cache_lock:
+        _long_text_cache[key] = result
+        if len(_long_text_cache) > SENTIMENT_CACHE_SIZE:
+            _long_text_cache.popitem(last=False)
+    return result
+
+
+def _text_cache_key(text):
+    """Return a fast 64-bit xxh3 digest of text for use as a cache key."""
+    return xxhash.xxh3_64_intdigest(text.encode('utf-8', 'ignore'))
+
+
+@functools.lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def _score_short_text(text):
+    """Memoized sentiment scoring for short texts such as headlines"""
+    return _score_text(text)
+
+
+def _score_text(text):
+    """Run VADER on the text"""
+    scores = _SIA.polarity_scores(text)
+    polarity = scores['compound']  # -1 (negative) to 1 (positive)
+
+    # Share of the text carrying sentiment: 0 (objective) to 1 (subjective)
+    subjectivity = scores['pos'] + scores['neg']
+
+    return polarity, subjectivity
+
+
+def classify_polarity(polarity):
+    """
+    Classify a polarity score as a sentiment label.
+
+    Parameters:
+        polarity (float): Polarity score from -1 (negative) to 1 (positive)
 
-    # Classify sentiment based on polarity
+    Returns:
+        tuple: (sentiment_label, emoji)
+    """
     if polarity > 0.1:
-        sentiment_label = "Positive"
-        emoji = "😊"
+        return "Positive", "😊"
     elif polarity < -0.1:
-        sentiment_label = "Negative"
-        emoji = "😠"
+        return "Negative", "😠"
     else:
-        sentiment_label = "Neutral"
-        emoji = "😐"
+        return "Neutral", "😐"
 
-    return polarity, subjectivity, sentiment_label, emoji
 
+def classify_polarities(polarities):
+    """
+    Classify a batch of polarity scores as sentiment labels in one vectorized pass.
+
+    Parameters:
+        polarities (array-like): Polarity scores from -1 (negative) to 1 (positive)
 
-def calculate_combined_sentiment(article_texts):
+    Returns:
+        tuple: (sentiment_labels, emojis) as NumPy arrays
     """
-    Calculate sentiment from all article texts combined
+    polarities = np.asarray(polarities, dtype=np.float64)
+    index = np.where(polarities > 0.1, 2, np.where(polarities < -0.1, 0, 1))
+    return _SENTIMENT_LABELS[index], _SENTIMENT_EMOJIS[index]
+
+
+def calculate_combined_sentiment(polarities, subjectivities, weights):
+    """
+    Calculate sentiment across all articles combined
+
+    The per-article scores are averaged, weighted by the length of each
+    article, instead of re-analyzing the concatenated text.
 
     Parameters:
-        article_texts (list): List of article text strings
+        polarities (list): Polarity score of each article
+        subjectivities (list): Subjectivity score of each article
+        weights (list): Weight of each article (its text length)
 
     Returns:
         dict or None: Combined sentiment metrics or None if no texts available
     """
-    combined_text = " ".join(article_texts)
-    if not combined_text:
+    weights = np.asarray(weights, dtype=np.float64)
+    if not weights.size or not weights.sum():
         return None
 
-    combined_polarity, combined_subjectivity, combined_sentiment_label, combined_emoji = analyze_sentiment(
-        combined_text)
+    combined_polarity = float(np.average(np.asarray(polarities, dtype=np.float64), weights=weights))
+    combined_subjectivity = float(np.average(np.asarray(subjectivities, dtype=np.float64), weights=weights))
+    combined_sentiment_label, combined_emoji = classify_polarity(combined_polarity)
 
     return {
         'polarity': combined_polarity,
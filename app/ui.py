@@ -5,8 +5,8 @@ User Interface Components
 Functions to create and render the user interface elements.
 """
 
+import pandas as pd
 import streamlit as st
-from datetime import datetime
 
 def create_main_section():
     """Create the main app title and description"""
@@ -28,7 +28,7 @@ def display_combined_sentiment(combined_sentiment):
         return
 
     st.subheader("Combined Sentiment Analysis")
-    st.write("This analysis combines the text of all articles into a single body for sentiment analysis.")
+    st.write("This analysis averages the sentiment of every article whose full text was extracted, weighting longer articles more.")
 
     combined_cols = st.columns(3)
     with combined_cols[0]:
@@ -54,25 +54,21 @@ def display_article_details(row):
     Display details for a single news article
 
     Parameters:
-        row (pandas.Series): A row from the news DataFrame
+        row (namedtuple): A row from the news DataFrame, as yielded by itertuples
     """
-    pub_time = row['published']
-    if isinstance(pub_time, int):
-        pub_time = datetime.fromtimestamp(pub_time).strftime('%Y-%m-%d %H:%M:%S')
-
-    st.write(f"**Publisher:** {row['publisher']} - {pub_time}")
+    st.write(f"**Publisher:** {row.publisher} - {row.published}")
 
     # Article sentiment information section
     st.write("### Sentiment Analysis")
 
-    st.write(f"**Sentiment:** {row['full_text_sentiment']} {row['full_text_emoji']}")
-    st.write(f"**Polarity:** {row['full_text_polarity']:.2f}")
-    st.write(f"**Subjectivity:** {row['full_text_subjectivity']:.2f}")
+    st.write(f"**Sentiment:** {row.full_text_sentiment} {row.full_text_emoji}")
+    st.write(f"**Polarity:** {row.full_text_polarity:.2f}")
+    st.write(f"**Subjectivity:** {row.full_text_subjectivity:.2f}")
 
     # Article text preview and link
     st.write("### Article Preview")
-    st.write(row['article_text'])
-    st.write(f"**Full Article:** [{row['title']}]({row['link']})")
+    st.write(row.article_text if not pd.isna(row.article_text) else "Could not extract full article text")
+    st.write(f"**Full Article:** [{row.title}]({row.link})")
 
 def display_news_articles(ticker, news_df):
     """
@@ -84,8 +80,8 @@ def display_news_articles(ticker, news_df):
     """
     st.subheader(f"Recent News Articles for {ticker}")
 
-    for i, row in news_df.iterrows():
-        with st.expander(f"{row['title']} {row['full_text_emoji']}"):
+    for row in news_df.itertuples(index=False):
+        with st.expander(f"{row.title} {row.full_text_emoji}"):
             display_article_details(row)
 
 
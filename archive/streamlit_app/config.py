@@ -17,7 +17,7 @@ def setup_page():
             'About': """
             ## Stock News Sentiment Analyzer
             This app analyzes the sentiment of recent news articles for a given stock ticker.
-            It uses yfinance to fetch news and TextBlob for sentiment analysis.
+            It uses yfinance to fetch news and VADER for sentiment analysis.
             """
         }
     )
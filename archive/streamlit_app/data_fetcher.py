@@ -1,75 +1,86 @@
-import time
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import streamlit as st
-from scraper import extract_article_text
-from sentiment import analyze_sentiment, calculate_combined_sentiment
+from scraper import extract_many
+from sentiment import calculate_combined_sentiment, classify_polarities, classify_polarity, score_many
 
-def get_stock_news(ticker_symbol: str, num_articles: int = 5) -> list:
-    """Fetch recent news articles for a given stock ticker."""
+def get_stock_news(ticker_symbol: str, num_articles: int = 5) -> tuple:
+    """Fetch recent news articles for a given stock ticker, returning (news, error)."""
     try:
         news = yf.Ticker(ticker_symbol).news # Changed yf.Search to yf.Ticker based on common yfinance usage
-        return news[:num_articles] if news else []
+        return (news[:num_articles] if news else []), None
     except Exception as e:
-        st.error(f"Error fetching news for {ticker_symbol}: {e}")
-        return []
+        return [], f"Error fetching news for {ticker_symbol}: {e}"
 
 
-def process_article(article: dict, index: int, total: int, status_text) -> dict:
-    """Process a single news article to extract and analyze sentiment."""
-    status_text.text(f"Processing article {index+1}/{total}...")
-    title = article.get('title', '')
-    # summary = article.get('summary', '') # yfinance Ticker.news might not have 'summary'
-    url = article.get('link', '')
-    headline = f"{title}" # Removed summary as it might not be present
-    h_pol, h_subj, h_label, h_emoji = analyze_sentiment(headline)
-    full_text = ""
-    if url:
-        status_text.text(f"Extracting text from article {index+1}...")
-        full_text = extract_article_text(url)
-        time.sleep(0.5)
-    if full_text:
-        f_pol, f_subj, f_label, f_emoji = analyze_sentiment(full_text)
-    else:
-        f_pol, f_subj, f_label, f_emoji = h_pol, h_subj, h_label, h_emoji
-        full_text = "Could not extract full article text"
+def _score_columns(scores: list, prefix: str) -> dict:
+    """Split (polarity, subjectivity) pairs into prefixed DataFrame columns, labelled in batch."""
+    pol, subj = np.array(scores, dtype=float).T
+    label, emoji = classify_polarities(pol)
     return {
-        'title': title,
-        'publisher': article.get('publisher', 'Unknown'),
-        'link': url,
-        'headline_polarity': h_pol,
-        'headline_subjectivity': h_subj,
-        'headline_sentiment': h_label,
-        'headline_emoji': h_emoji,
-        'full_text_polarity': f_pol,
-        'full_text_subjectivity': f_subj,
-        'full_text_sentiment': f_label,
-        'full_text_emoji': f_emoji,
-        'article_text': (full_text[:500] + '...') if len(full_text) > 500 else full_text,
-        'published': article.get('providerPublishTime', 'Unknown'), # yfinance uses providerPublishTime
-        'raw_text': full_text
+        f'{prefix}_polarity': pol,
+        f'{prefix}_subjectivity': subj,
+        f'{prefix}_sentiment': label,
+        f'{prefix}_emoji': emoji,
     }
 
-def analyze_stock_news_sentiment(ticker: str, num_articles: int):
-    """Analyze sentiment of stock news articles."""
-    articles = get_stock_news(ticker, num_articles)
+
+def _preview(text: str) -> str:
+    """Shorten scraped text for display in the article expander."""
+    if not text:
+        return "Could not extract full article text"
+    return (text[:500] + '...') if len(text) > 500 else text
+
+
+class IncompleteAnalysisError(Exception):
+    """Carries results with errors out of the cached analysis, so Streamlit doesn't cache them."""
+
+    def __init__(self, results, messages):
+        super().__init__(messages)
+        self.results = results
+        self.messages = messages
+
+
+def _analyze(ticker: str, num_articles: int):
+    """
+    Analyze sentiment of stock news articles without drawing anything.
+    Returns the results and a list of (level, text) messages for the caller to show.
+    """
+    articles, error = get_stock_news(ticker, num_articles)
+    messages = [('error', error)] if error else []
     if not articles:
-        return 0,0,"Neutral",pd.DataFrame(),None
-    progress = st.progress(0)
-    status = st.empty()
-    results = []
-    texts = []
-    for i, art in enumerate(articles):
-        data = process_article(art, i, len(articles), status)
-        results.append(data)
-        if data['raw_text']:
-            texts.append(data['raw_text'])
-        progress.progress((i+1)/len(articles))
-    progress.empty()
-    status.empty()
-    df = pd.DataFrame(results).drop(columns=['raw_text'])
+        return (0,0,"Neutral",pd.DataFrame(),None), messages
+    scraped = extract_many([art.get('link', '') for art in articles])
+    messages += [('warning', err) for _, err in scraped if err]
+    full_texts = [text for text, _ in scraped]
+    # yfinance Ticker.news might not have 'summary', so headlines are titles only
+    titles = pd.Series([art.get('title', '') for art in articles])
+    texts = pd.Series(full_texts)
+    headline_scores = score_many(titles.tolist())
+    # articles without extracted text fall back to their headline's score
+    full_scores = score_many(texts.where(texts != '', titles).tolist())
+    df = pd.DataFrame({
+        'title': titles,
+        'publisher': [art.get('publisher', 'Unknown') for art in articles],
+        'link': [art.get('link', '') for art in articles],
+        **_score_columns(headline_scores, 'headline'),
+        **_score_columns(full_scores, 'full_text'),
+        'article_text': texts.map(_preview),
+        'published': [art.get('providerPublishTime', 'Unknown') for art in articles], # yfinance uses providerPublishTime
+    })
     avg_pol = df['full_text_polarity'].mean() if not df.empty else 0
     avg_subj = df['full_text_subjectivity'].mean() if not df.empty else 0
-    overall = "Positive" if avg_pol>0.1 else "Negative" if avg_pol<-0.1 else "Neutral"
-    combined = calculate_combined_sentiment(texts)
-    return avg_pol, avg_subj, overall, df, combined
\ No newline at end of file
+    overall, _ = classify_polarity(avg_pol)
+    extracted = df.loc[texts != '', ['full_text_polarity', 'full_text_subjectivity']]
+    combined = calculate_combined_sentiment(list(extracted.itertuples(index=False, name=None)))
+    return (avg_pol, avg_subj, overall, df, combined), messages
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def analyze_stock_news_sentiment(ticker: str, num_articles: int):
+    """Analyze sentiment of stock news articles, caching only complete results per (ticker, num_articles)."""
+    results, messages = _analyze(ticker, num_articles)
+    if messages:
+        raise IncompleteAnalysisError(results, messages)
+    return results
\ No newline at end of file
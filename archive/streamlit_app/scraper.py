@@ -1,27 +1,52 @@
-import requests
-from bs4 import BeautifulSoup
-import re
-import streamlit as st
-
-def extract_article_text(url: str) -> str:
-    """Extract main text content from a news article URL."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-    }
+import asyncio
+
+import aiohttp
+from selectolax.parser import HTMLParser
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
+}
+MAX_CONCURRENT_FETCHES = 20
+MAX_PAGE_BYTES = 512_000  # plenty for article text; skips the rest of bloated pages
+_BOILER = "Oops, something went wrong Unlock stock picks and a broker-level newsfeed that powers Wall"
+
+
+def parse_html(html: bytes) -> str:
+    """Extract main text content from an article's raw HTML bytes."""
+    tree = HTMLParser(html)
+    tree.strip_tags(['script', 'style', 'header', 'footer', 'nav'])
+    text = ' '.join(node.text(strip=True) for node in tree.css('p'))
+    # str.split() collapses any run of whitespace in C, faster than a regex
+    return ' '.join(text.split()).replace(_BOILER, '').strip()
+
+
+async def _fetch(session: aiohttp.ClientSession, url: str, semaphore: asyncio.BoundedSemaphore) -> tuple:
+    """Fetch one article and extract its (text, error); parsing runs in a worker thread."""
+    if not url:
+        return "", None
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        if resp.status_code != 200:
-            return ""
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        for tag in soup(['script', 'style', 'header', 'footer', 'nav']):
-            tag.extract()
-        paragraphs = soup.find_all('p')
-        text = " ".join([p.get_text().strip() for p in paragraphs])
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = text.replace(
-            "Oops, something went wrong Unlock stock picks and a broker-level newsfeed that powers Wall", ""
-        )
-        return text
+        async with semaphore:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status != 200:
+                    return "", None
+                html = bytearray()
+                async for chunk in resp.content.iter_chunked(65536):
+                    html += chunk
+                    if len(html) >= MAX_PAGE_BYTES:
+                        break
+        html = bytes(html[:MAX_PAGE_BYTES])
+        return await asyncio.get_running_loop().run_in_executor(None, parse_html, html), None
     except Exception as e:
-        st.warning(f"Could not extract text from {url}: {e}")
-        return ""
\ No newline at end of file
+        return "", f"Could not extract text from {url}: {e}"
+
+
+async def _gather(urls: list) -> list:
+    """Fetch all URLs concurrently over one shared session."""
+    semaphore = asyncio.BoundedSemaphore(MAX_CONCURRENT_FETCHES)
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        return await asyncio.gather(*[_fetch(session, url, semaphore) for url in urls])
+
+
+def extract_many(urls: list) -> list:
+    """Extract (text, error) pairs from many article URLs concurrently, in the same order."""
+    return asyncio.run(_gather(urls))
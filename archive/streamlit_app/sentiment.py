@@ -1,30 +1,72 @@
-from textblob import TextBlob
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Bin edges for np.digitize; nudging 0.1 up keeps exactly ±0.1 Neutral, as in classify_polarity
+_LABEL_BINS = np.array([-0.1, np.nextafter(0.1, 1.0)])
+_LABELS = np.array(["Negative", "Neutral", "Positive"])
+_EMOJIS = np.array(["😠", "😐", "😊"])
+
+
+@st.cache_resource
+def get_analyzer() -> SentimentIntensityAnalyzer:
+    """Load the VADER lexicon once per server process and share it across sessions."""
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=1024)
+def score_sentiment(text: str) -> tuple[float, float]:
+    """
+    Score text with VADER, returning polarity and subjectivity.
+    Results are memoized, so reruns don't re-score the same articles.
+    """
+    s = get_analyzer().polarity_scores(text)
+    return s['compound'], s['pos'] + s['neg']  # subjectivity: share of the text carrying sentiment
+
 
 def analyze_sentiment(text: str):
     """
-    Analyze text sentiment using TextBlob.
+    Analyze text sentiment using VADER.
     Returns polarity, subjectivity, sentiment label, and emoji.
     """
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
+    polarity, subjectivity = score_sentiment(text)
+    return (polarity, subjectivity) + classify_polarity(polarity)
+
+
+def classify_polarity(polarity: float):
+    """Map a polarity score to its sentiment label and emoji."""
     if polarity > 0.1:
-        label, emoji = "Positive", "😊"
-    elif polarity < -0.1:
-        label, emoji = "Negative", "😠"
-    else:
-        label, emoji = "Neutral", "😐"
-    return polarity, subjectivity, label, emoji
+        return "Positive", "😊"
+    if polarity < -0.1:
+        return "Negative", "😠"
+    return "Neutral", "😐"
+
+
+def classify_polarities(polarities: np.ndarray):
+    """Map an array of polarity scores to label and emoji arrays in one vectorized pass."""
+    idx = np.digitize(polarities, _LABEL_BINS)
+    return _LABELS[idx], _EMOJIS[idx]
+
+
+def score_many(texts: list) -> list:
+    """
+    Score a batch of texts, returning (polarity, subjectivity) pairs in the same order.
+    Runs in-process, so repeated texts hit the score_sentiment memo.
+    """
+    return [score_sentiment(t) for t in texts]
 
 
-def calculate_combined_sentiment(article_texts: list):
+def calculate_combined_sentiment(per_article_scores: list[tuple[float, float]]):
     """
-    Calculate sentiment from all article texts combined.
+    Calculate combined sentiment by averaging per-article (polarity, subjectivity) scores.
     """
-    if not article_texts:
+    if not per_article_scores:
         return None
-    combined_text = " ".join(article_texts)
-    polarity, subjectivity, label, emoji = analyze_sentiment(combined_text)
+    polarity = sum(p for p, _ in per_article_scores) / len(per_article_scores)
+    subjectivity = sum(q for _, q in per_article_scores) / len(per_article_scores)
+    label, emoji = classify_polarity(polarity)
     return {
         'polarity': polarity,
         'subjectivity': subjectivity,
@@ -11,6 +11,7 @@ def initialize_session_state():
         'news_df': pd.DataFrame(),
         'combined_sentiment': None,
         'analysis_performed': False,
+        'last_key': None,  # (ticker, num_articles) the saved results belong to
         'num_articles': 5,
     }
     for key, value in defaults.items():
@@ -6,7 +6,7 @@ def display_combined_sentiment(combined):
     if not combined:
         return
     st.subheader("Combined Sentiment Analysis")
-    st.write("Combines all article texts for holistic sentiment.")
+    st.write("Averages the sentiment of all articles whose text was extracted.")
     cols = st.columns(3)
     cols[0].metric("Combined Sentiment", f"{combined['sentiment']} {combined['emoji']}")
     cols[1].metric("Combined Polarity", f"{combined['polarity']:.2f}")
@@ -22,40 +22,49 @@ def display_article_details(row):
     else: # Fallback for unknown format
         pub = str(pub)
 
-    st.write(f"**Publisher:** {row['publisher']} - {pub}")
-    st.write("### Sentiment Analysis")
-    st.write(f"**Sentiment:** {row['full_text_sentiment']} {row['full_text_emoji']}")
-    st.write(f"**Polarity:** {row['full_text_polarity']:.2f}")
-    st.write(f"**Subjectivity:** {row['full_text_subjectivity']:.2f}")
-    st.write("### Article Preview")
-    st.write(row['article_text'])
-    st.write(f"**Full Article:** [{row['title']}]({row['link']})")
+    # One markdown block is a single frontend delta instead of one per st.write
+    st.markdown(
+        f"**Publisher:** {row['publisher']} - {pub}\n\n"
+        "### Sentiment Analysis\n\n"
+        f"**Sentiment:** {row['full_text_sentiment']} {row['full_text_emoji']}\n\n"
+        f"**Polarity:** {row['full_text_polarity']:.2f}\n\n"
+        f"**Subjectivity:** {row['full_text_subjectivity']:.2f}\n\n"
+        "### Article Preview\n\n"
+        f"{row['article_text']}\n\n"
+        f"**Full Article:** [{row['title']}]({row['link']})"
+    )
 
 def display_news_articles(ticker, df):
     """Display news articles in expanders."""
     st.subheader(f"Recent News Articles for {ticker}")
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         with st.expander(f"{row['title']} {row['full_text_emoji']}"):
             display_article_details(row)
 
 def perform_stock_news_analysis(ticker):
     """Run sentiment analysis and display results."""
-    from data_fetcher import analyze_stock_news_sentiment # Keep import here to avoid circular dependency if ui is imported elsewhere
+    from data_fetcher import IncompleteAnalysisError, analyze_stock_news_sentiment # Keep import here to avoid circular dependency if ui is imported elsewhere
     state = st.session_state
     if not ticker:
         st.warning("Please enter a ticker.")
         return
-    if state.ticker == ticker and state.analysis_performed:
+    key = (ticker, state.num_articles)
+    if state.analysis_performed and state.last_key == key:
         avg_pol, avg_subj, overall, df, combined = (
             state.avg_polarity, state.avg_subjectivity,
             state.overall_sentiment, state.news_df, state.combined_sentiment
         )
     else:
         with st.spinner(f"Analyzing {ticker} news..."):
-            avg_pol, avg_subj, overall, df, combined = analyze_stock_news_sentiment(
-                ticker, state.num_articles
-            )
+            try:
+                results, messages = analyze_stock_news_sentiment(ticker, state.num_articles), []
+            except IncompleteAnalysisError as incomplete:
+                results, messages = incomplete.results, incomplete.messages
+        for level, message in messages:
+            (st.error if level == 'error' else st.warning)(message)
+        avg_pol, avg_subj, overall, df, combined = results
         state.ticker = ticker
+        state.last_key = key
         state.avg_polarity = avg_pol
         state.avg_subjectivity = avg_subj
         state.overall_sentiment = overall
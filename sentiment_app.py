@@ -1,6 +1,6 @@
 # -------------- SECTION 1: IMPORTS --------------
 import streamlit as st
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 # -------------- SECTION 2: PAGE CONFIGURATION --------------
 def setup_page():
@@ -18,7 +18,7 @@ def create_sidebar():
     """Create the sidebar with information about the app"""
     st.sidebar.header("About This App")
     st.sidebar.info(
-        "This app uses the **TextBlob** library to perform basic sentiment analysis. "
+        "This app uses the **VADER** sentiment analyzer to perform basic sentiment analysis. "
     )
 
     st.sidebar.header("How It Works")
@@ -26,9 +26,9 @@ def create_sidebar():
         """
         1. You enter text in the text area.
         2. Click the 'Analyze Sentiment' button.
-        3. The app uses `TextBlob` to calculate:
+        3. The app uses `VADER` to calculate:
             * **Polarity**: Negative (-1) to Positive (+1)
-            * **Subjectivity**: Objective (0) to Subjective (1)
+            * **Subjectivity**: Share of the text carrying sentiment, from Objective (0) to Subjective (1)
         4. It classifies the sentiment based on the polarity score.
         """
     )
@@ -39,7 +39,7 @@ def create_main_section():
     st.title("💬 Simple Sentiment Analysis App")
     st.write(
         "Enter some text below, and we'll analyze its sentiment (Positive, Negative, or Neutral) "
-        "using the TextBlob library."
+        "using the VADER sentiment analyzer."
     )
     st.markdown("---")
 
@@ -58,9 +58,15 @@ def create_text_input():
     )
 
 # -------------- SECTION 5: SENTIMENT ANALYSIS LOGIC --------------
+@st.cache_resource
+def get_analyzer():
+    """Load the VADER lexicon once and share it across reruns and sessions"""
+    return SentimentIntensityAnalyzer()
+
+
 def analyze_sentiment(text):
     """
-    Analyze text sentiment using TextBlob.
+    Analyze text sentiment using VADER.
 
     Parameters:
         text (str): The text to analyze
@@ -72,10 +78,10 @@ def analyze_sentiment(text):
     if not text:
         return 0.0, 0.0, "Neutral", "😐"
 
-    # Process text with TextBlob
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity  # -1 (negative) to 1 (positive)
-    subjectivity = blob.sentiment.subjectivity  # 0 (objective) to 1 (subjective)
+    # Process text with VADER
+    scores = get_analyzer().polarity_scores(text)
+    polarity = scores['compound']  # -1 (negative) to 1 (positive)
+    subjectivity = scores['pos'] + scores['neg']  # 0 (objective) to 1 (subjective)
 
     # Classify sentiment based on polarity
     if polarity > 0.1:
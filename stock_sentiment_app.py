@@ -1,8 +1,6 @@
 from datetime import datetime
 
 import streamlit as st
-from textblob import TextBlob
-import yfinance as yf
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
@@ -137,25 +135,25 @@ def display_article_details(row):
     Display details for a single news article
 
     Parameters:
-        row (pandas.Series): A row from the news DataFrame
+        row (dict): A record from the news DataFrame
     """
     pub_time = row['published']
     if isinstance(pub_time, int):
         pub_time = datetime.fromtimestamp(pub_time).strftime('%Y-%m-%d %H:%M:%S')
 
-    st.write(f"**Publisher:** {row['publisher']} - {pub_time}")
-
-    # Article sentiment information section
-    st.write("### Sentiment Analysis")
-
-    st.write(f"**Sentiment:** {row['full_text_sentiment']} {row['full_text_emoji']}")
-    st.write(f"**Polarity:** {row['full_text_polarity']:.2f}")
-    st.write(f"**Subjectivity:** {row['full_text_subjectivity']:.2f}")
-
-    # Article text preview and link
-    st.write("### Article Preview")
-    st.write(row['article_text'])
-    st.write(f"**Full Article:** [{row['title']}]({row['link']})")
+    # Render everything in one markdown block: one frontend update instead of seven
+    st.markdown(
+        f"**Publisher:** {row['publisher']} - {pub_time}\n\n"
+        # Article sentiment information section
+        "### Sentiment Analysis\n\n"
+        f"**Sentiment:** {row['full_text_sentiment']} {row['full_text_emoji']}\n\n"
+        f"**Polarity:** {row['full_text_polarity']:.2f}\n\n"
+        f"**Subjectivity:** {row['full_text_subjectivity']:.2f}\n\n"
+        # Article text preview and link
+        "### Article Preview\n\n"
+        f"{row['article_text']}\n\n"
+        f"**Full Article:** [{row['title']}]({row['link']})"
+    )
 
 
 def display_news_articles(ticker, news_df):
@@ -168,7 +166,7 @@ def display_news_articles(ticker, news_df):
     """
     st.subheader(f"Recent News Articles for {ticker}")
 
-    for i, row in news_df.iterrows():
+    for row in news_df.to_dict('records'):
         with st.expander(f"{row['title']} {row['full_text_emoji']}"):
             display_article_details(row)
 